@@ -1,40 +1,24 @@
 #!/usr/bin/env python3
 """Analyze PPM frame dumps to identify color issues."""
 
-import struct
+import io
+import os
 import sys
-from collections import Counter
+from contextlib import redirect_stdout
+from functools import lru_cache
+from multiprocessing import Pool
+
+import numpy as np
+
+from ppm_io import load_rgb, pack_rgb, top_k, unpack_rgb
 
 def read_ppm(filename):
-    """Read a P6 PPM file and return width, height, and pixel data."""
-    with open(filename, 'rb') as f:
-        # Read header
-        magic = f.readline().strip()
-        if magic != b'P6':
-            raise ValueError(f"Not a P6 PPM file: {magic}")
-        
-        # Skip comments
-        line = f.readline()
-        while line.startswith(b'#'):
-            line = f.readline()
-        
-        # Parse dimensions
-        width, height = map(int, line.split())
-        
-        # Read max color value
-        maxval = int(f.readline().strip())
-        
-        # Read pixel data
-        pixels = []
-        for y in range(height):
-            row = []
-            for x in range(width):
-                r, g, b = struct.unpack('BBB', f.read(3))
-                row.append((r, g, b))
-            pixels.append(row)
-        
-        return width, height, pixels
+    """Read a P6 PPM file and return width, height, and a (height, width, 3) uint8 array."""
+    pixels = load_rgb(filename)
+    height, width, _ = pixels.shape
+    return width, height, pixels
 
+@lru_cache(maxsize=None)
 def describe_color(r, g, b):
     """Give a human-readable description of an RGB color."""
     if r < 20 and g < 20 and b < 20:
@@ -68,14 +52,15 @@ def analyze_frame(filename):
     width, height, pixels = read_ppm(filename)
     print(f"Dimensions: {width}x{height}")
     
-    # Count all colors
-    color_counts = Counter()
-    for row in pixels:
-        for rgb in row:
-            color_counts[rgb] += 1
+    # Count all colors (one np.unique over packed 0xRRGGBB keys; the same key
+    # array feeds the sprite-area histogram below)
+    keys = pack_rgb(pixels)
+    colors, counts = np.unique(keys, return_counts=True)
     
     # Find dominant colors (excluding very common background colors)
-    sorted_colors = color_counts.most_common(20)
+    top = top_k(counts, 20)
+    background_key = colors[top[0]]
+    sorted_colors = [(unpack_rgb(colors[i]), int(counts[i])) for i in top]
     print(f"\nTop 20 colors:")
     for i, ((r, g, b), count) in enumerate(sorted_colors, 1):
         pct = (count / (width * height)) * 100
@@ -83,36 +68,46 @@ def analyze_frame(filename):
         print(f"  {i:2}. RGB({r:3},{g:3},{b:3}) = {desc:15} : {count:6} pixels ({pct:5.1f}%)")
     
     # Look for pink/magenta pixels (potential problem colors)
-    pink_pixels = []
-    for y, row in enumerate(pixels):
-        for x, (r, g, b) in enumerate(row):
-            # Pink: high red, low green, medium-high blue
-            if r > 150 and g < 120 and b > 100 and b < r:
-                pink_pixels.append((x, y, r, g, b))
+    # Pink: high red, low green, medium-high blue
+    r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
+    pink_mask = (r > 150) & (g < 120) & (b > 100) & (b < r)
     
-    if pink_pixels:
-        print(f"\nFound {len(pink_pixels)} PINK pixels!")
+    # any() stops at the first hit, so pink-free frames skip the index scan
+    if pink_mask.any():
+        print(f"\nFound {np.count_nonzero(pink_mask)} PINK pixels!")
         print("Sample locations (first 10):")
-        for x, y, r, g, b in pink_pixels[:10]:
-            print(f"  ({x:3},{y:3}): RGB({r},{g},{b})")
+        pink_ys, pink_xs = np.divmod(np.flatnonzero(pink_mask)[:10], width)
+        for x, y in zip(pink_xs.tolist(), pink_ys.tolist()):
+            pr, pg, pb = pixels[y, x].tolist()
+            print(f"  ({x:3},{y:3}): RGB({pr},{pg},{pb})")
     else:
         print("\nNo obvious pink pixels found.")
     
     # Look for sprites (non-background objects in typical sprite Y range)
     sprite_y_start = 20
     sprite_y_end = 150
-    sprite_colors = Counter()
-    for y in range(sprite_y_start, min(sprite_y_end, height)):
-        for rgb in pixels[y]:
-            if rgb != sorted_colors[0][0]:  # Not the most common (background) color
-                sprite_colors[rgb] += 1
+    sprite_keys = keys[sprite_y_start:sprite_y_end].ravel()
+    sprite_keys = sprite_keys[sprite_keys != background_key]  # Not the most common (background) color
     
-    if sprite_colors:
+    if sprite_keys.size:
+        sprite_colors, sprite_counts = np.unique(sprite_keys, return_counts=True)
         print(f"\nSprite-area colors (Y={sprite_y_start}-{sprite_y_end}, excluding dominant background):")
-        for (r, g, b), count in sprite_colors.most_common(10):
+        for i in top_k(sprite_counts, 10):
+            r, g, b = unpack_rgb(sprite_colors[i])
+            count = sprite_counts[i]
             desc = describe_color(r, g, b)
             print(f"  RGB({r:3},{g:3},{b:3}) = {desc:15} : {count:5} pixels")
 
+def _analyze_to_text(filename):
+    """Run analyze_frame in a worker and return its report as text."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        try:
+            analyze_frame(filename)
+        except Exception as e:
+            print(f"\nError analyzing {filename}: {e}")
+    return buf.getvalue()
+
 if __name__ == "__main__":
     frames = [
         "dumps/ppu_frame_2195.ppm",  # Rope frame
@@ -121,8 +116,8 @@ if __name__ == "__main__":
         "dumps/ppu_frame_2395.ppm",  # After alligator disappears
     ]
     
-    for frame in frames:
-        try:
-            analyze_frame(frame)
-        except Exception as e:
-            print(f"\nError analyzing {frame}: {e}")
+    # Frames are independent: analyze them in parallel, but print each report
+    # whole and in list order (imap yields as soon as the next one is ready).
+    with Pool(min(len(frames), os.cpu_count() or 1)) as pool:
+        for report in pool.imap(_analyze_to_text, frames):
+            sys.stdout.write(report)
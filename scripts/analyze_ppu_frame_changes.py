@@ -13,13 +13,21 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import mmap
+import os
 import re
+from bisect import bisect_left
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 PPU_RE = re.compile(r"\[PPU_FRAME\]\s+f=(?P<f>\d+)\s+(?P<rest>.*)$")
 SCRIPT_RE = re.compile(r"\[SCRIPT\]\s+(?P<rest>.*)$")
 
+# Byte markers located with mmap.find (a C memchr/memcmp scan), so the rest of
+# the (usually huge) log is never decoded or split into lines.
+PPU_TAG = b"[PPU_FRAME]"
+SCRIPT_TAG = b"[SCRIPT]"
+
 # Key=VALUE tokens, where VALUE may be 0x... or decimal.
 TOKEN_RE = re.compile(r"(?P<k>[A-Z0-9_]+)=(?P<v>0x[0-9a-fA-F]+|\d+)")
 
@@ -53,10 +61,6 @@ FIELDS_OF_INTEREST = [
 ]
 
 
-def parse_int(s: str) -> int:
-    return int(s, 16) if s.lower().startswith("0x") else int(s)
-
-
 @dataclass
 class PPUFrame:
     line_no: int
@@ -72,10 +76,12 @@ class ScriptMarker:
 
 
 def parse_ppu_fields(rest: str) -> Dict[str, int]:
-    out: Dict[str, int] = {}
-    for m in TOKEN_RE.finditer(rest):
-        out[m.group("k")] = parse_int(m.group("v"))
-    return out
+    # Hot path on large logs: one comprehension, base picked from the second char
+    # (TOKEN_RE only admits "0x..." or decimal digits).
+    return {
+        k: int(v, 16) if v[1:2] in ("x", "X") else int(v)
+        for k, v in TOKEN_RE.findall(rest)
+    }
 
 
 def diff_fields(prev: Dict[str, int], cur: Dict[str, int], keys: List[str]) -> List[Tuple[str, Optional[int], Optional[int]]]:
@@ -95,6 +101,83 @@ def fmt_val(v: Optional[int]) -> str:
     return f"0x{v:X}" if v > 9 else str(v)
 
 
+def scan_log(path: str) -> Tuple[List[PPUFrame], List[ScriptMarker]]:
+    frames: List[PPUFrame] = []
+    scripts: List[ScriptMarker] = []
+
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return frames, scripts
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with mm:
+        end = len(mm)
+        # Text-mode reading (universal newlines) also ends lines at a lone
+        # "\r"; only pay for that bookkeeping when the log contains one.
+        has_cr = mm.find(b"\r") >= 0
+        next_ppu = mm.find(PPU_TAG)
+        next_script = mm.find(SCRIPT_TAG)
+        idx = 1  # line number of `counted`
+        counted = 0
+        while next_ppu >= 0 or next_script >= 0:
+            hit = next_ppu if next_script < 0 or 0 <= next_ppu < next_script else next_script
+            if has_cr:
+                line_start = max(mm.rfind(b"\n", 0, hit), mm.rfind(b"\r", 0, hit)) + 1
+                nl = mm.find(b"\n", hit)
+                cr = mm.find(b"\r", hit, nl if nl >= 0 else end)
+                line_end = cr if cr >= 0 else nl
+                if line_end < 0:
+                    line_end = end
+                # "\r\n" is one terminator.
+                term = 2 if mm[line_end:line_end + 2] == b"\r\n" else 1
+                seg = mm[counted:line_start]
+                idx += seg.count(b"\n") + seg.count(b"\r") - seg.count(b"\r\n")
+            else:
+                line_start = mm.rfind(b"\n", 0, hit) + 1
+                line_end = mm.find(b"\n", hit)
+                if line_end < 0:
+                    line_end = end
+                term = 1
+                idx += mm[counted:line_start].count(b"\n")
+            counted = line_start
+
+            line = mm[line_start:line_end].decode("utf-8", errors="replace")
+            # Match with the terminator still attached, as line iteration did:
+            # both patterns need a \s+ after the tag / f=N, which a bare
+            # "[SCRIPT]" line only satisfies with its newline.
+            text = line + "\n" if line_end < end else line
+            if "[PPU_FRAME]" in line:
+                m = PPU_RE.search(text)
+                if m:
+                    fno = int(m.group("f"))
+                    fields = parse_ppu_fields(m.group("rest"))
+                    frames.append(PPUFrame(line_no=idx, raw_line=line, f=fno, fields=fields))
+            elif SCRIPT_RE.search(text):
+                scripts.append(ScriptMarker(line_no=idx, raw_line=line))
+
+            # Resume after this line; a marker is only re-searched once passed.
+            pos = line_end + term
+            if 0 <= next_ppu < pos:
+                next_ppu = mm.find(PPU_TAG, pos)
+            if 0 <= next_script < pos:
+                next_script = mm.find(SCRIPT_TAG, pos)
+
+    return frames, scripts
+
+
+def nearest_frame_index(frame_lines: List[int], line_no: int) -> int:
+    """Index of the frame line closest to line_no (earlier frame wins ties).
+
+    frame_lines must be sorted and non-empty.
+    """
+    lo = bisect_left(frame_lines, line_no)
+    if lo == 0:
+        return 0
+    if lo == len(frame_lines):
+        return lo - 1
+    return lo if frame_lines[lo] - line_no < line_no - frame_lines[lo - 1] else lo - 1
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("log", help="Path to debug.log")
@@ -103,21 +186,7 @@ def main() -> int:
     ap.add_argument("--script-window", type=int, default=8, help="PPU frames to show before/after each [SCRIPT] marker")
     args = ap.parse_args()
 
-    frames: List[PPUFrame] = []
-    scripts: List[ScriptMarker] = []
-
-    with open(args.log, "r", errors="replace") as f:
-        for idx, line in enumerate(f, start=1):
-            if "[PPU_FRAME]" in line:
-                m = PPU_RE.search(line)
-                if not m:
-                    continue
-                fno = int(m.group("f"))
-                fields = parse_ppu_fields(m.group("rest"))
-                frames.append(PPUFrame(line_no=idx, raw_line=line.rstrip("\n"), f=fno, fields=fields))
-            elif "[SCRIPT]" in line:
-                if SCRIPT_RE.search(line):
-                    scripts.append(ScriptMarker(line_no=idx, raw_line=line.rstrip("\n")))
+    frames, scripts = scan_log(args.log)
 
     if not frames:
         print("No [PPU_FRAME] lines found.")
@@ -130,9 +199,14 @@ def main() -> int:
         print(f"First PPU frame: f={prev.f} at log line {prev.line_no}")
         print(prev.raw_line)
 
+    # Snapshot the fields of interest as one tuple per frame (map(dict.get) runs
+    # in C), so unchanged consecutive frames cost a single tuple compare; the
+    # per-key diff only runs for frames that actually changed.
+    prev_vals = tuple(map(prev.fields.get, FIELDS_OF_INTEREST))
     for cur in frames[1:]:
-        diffs = diff_fields(prev.fields, cur.fields, FIELDS_OF_INTEREST)
-        if diffs:
+        cur_vals = tuple(map(cur.fields.get, FIELDS_OF_INTEREST))
+        if cur_vals != prev_vals:
+            diffs = diff_fields(prev.fields, cur.fields, FIELDS_OF_INTEREST)
             printed += 1
             if printed <= args.max:
                 print("\n=== PPU change ===")
@@ -148,37 +222,15 @@ def main() -> int:
                 print(f"\n(reached --max {args.max}; stopping change output)")
                 break
         prev = cur
+        prev_vals = cur_vals
 
     # If script markers exist, print nearby PPU frames by line proximity.
     if scripts:
         print("\n\n=== SCRIPT markers ===")
         frame_lines = [fr.line_no for fr in frames]
 
-        def nearest_frame_index(line_no: int) -> int:
-            # Binary search on frame_lines
-            lo, hi = 0, len(frame_lines)
-            while lo < hi:
-                mid = (lo + hi) // 2
-                if frame_lines[mid] < line_no:
-                    lo = mid + 1
-                else:
-                    hi = mid
-            # lo is first >= line_no; choose closest of lo-1, lo
-            cand = []
-            if lo - 1 >= 0:
-                cand.append(lo - 1)
-            if lo < len(frame_lines):
-                cand.append(lo)
-            best = cand[0]
-            best_dist = abs(frame_lines[best] - line_no)
-            for c in cand[1:]:
-                d = abs(frame_lines[c] - line_no)
-                if d < best_dist:
-                    best, best_dist = c, d
-            return best
-
         for sm in scripts:
-            idx = nearest_frame_index(sm.line_no)
+            idx = nearest_frame_index(frame_lines, sm.line_no)
             start = max(0, idx - args.script_window)
             end = min(len(frames) - 1, idx + args.script_window)
             print("\n---")
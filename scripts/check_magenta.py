@@ -1,31 +1,26 @@
 #!/usr/bin/env python3
-with open('dumps/dkc_frame_2645.ppm', 'rb') as f:
-    f.readline()
-    f.readline()
-    f.readline()
-    pixels = f.read()
+import numpy as np
+
+from ppm_io import load_rgb, pack_rgb, top_k, unpack_rgb
+
+pixels = load_rgb('dumps/dkc_frame_2645.ppm')
+r, g, b = pixels[..., 0], pixels[..., 1], pixels[..., 2]
 
 # Find ALL pink/magenta-ish pixels (high red+blue, low green)
-pink_pos = []
-for y in range(160):
-    for x in range(240):
-        i = (y * 240 + x) * 3
-        r, g, b = pixels[i], pixels[i+1], pixels[i+2]
-        # Pink: high R and B, low G
-        if r > 100 and b > 100 and g < 150 and r > g and b > g:
-            pink_pos.append((x, y, r, g, b))
+mask = (r > 100) & (b > 100) & (g < 150) & (r > g) & (b > g)
+ys, xs = np.nonzero(mask)
 
-print(f'Pink pixels: {len(pink_pos)}')
-if pink_pos:
+print(f'Pink pixels: {len(ys)}')
+if len(ys):
     print('First 10 with RGB:')
-    for x, y, r, g, b in pink_pos[:10]:
-        print(f'  ({x}, {y}) RGB({r},{g},{b})')
-    y_vals = [y for x,y,_,_,_ in pink_pos]
-    print(f'Y range: {min(y_vals)}-{max(y_vals)}')
+    for x, y in zip(xs[:10].tolist(), ys[:10].tolist()):
+        pr, pg, pb = pixels[y, x].tolist()
+        print(f'  ({x}, {y}) RGB({pr},{pg},{pb})')
+    print(f'Y range: {ys.min()}-{ys.max()}')
     
     # Show unique colors
-    from collections import Counter
-    colors = Counter([(r,g,b) for _,_,r,g,b in pink_pos])
+    colors, counts = np.unique(pack_rgb(pixels[mask]), return_counts=True)
     print('Unique pink colors:')
-    for (r,g,b), count in colors.most_common(10):
-        print(f'  RGB({r},{g},{b}): {count} pixels')
+    for i in top_k(counts, 10):
+        cr, cg, cb = unpack_rgb(colors[i])
+        print(f'  RGB({cr},{cg},{cb}): {counts[i]} pixels')
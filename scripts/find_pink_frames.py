@@ -1,30 +1,33 @@
 #!/usr/bin/env python3
 """Find frames with pink pixels in PPM dumps."""
 
-import struct
 import sys
-from collections import Counter
+
+import numpy as np
+
+from ppm_io import load_rgb, pack_rgb, top_k, unpack_rgb
+
+# Reused by every analyze_frame() call so a long sweep does no per-frame allocation.
+_BUF = np.empty(240*160*3, np.uint8)
 
 def analyze_frame(frame_num, ppm_path='dumps'):
     try:
-        with open(f'{ppm_path}/ppu_frame_{frame_num}.ppm', 'rb') as f:
-            f.readline(); f.readline(); f.readline()
-            colors = [struct.unpack('BBB', f.read(3)) for _ in range(240*160)]
-        
-        counter = Counter(colors)
-        pink_pixels = [(r,g,b,cnt) for (r,g,b), cnt in counter.items() 
-                       if r > 150 and g < 150 and b > 120]
-        pink_count = sum(cnt for _,_,_,cnt in pink_pixels)
-        
-        if pink_count > 0:
-            print(f'Frame {frame_num}: {pink_count:5} PINK pixels ({pink_count/len(colors)*100:5.2f}%)')
-            for r,g,b,cnt in sorted(pink_pixels, key=lambda x: -x[3])[:3]:
-                print(f'  RGB({r},{g},{b}): {cnt} pixels')
-            return True
-        return False
+        pix = load_rgb(f'{ppm_path}/ppu_frame_{frame_num}.ppm', out=_BUF).reshape(-1, 3)
     except FileNotFoundError:
         return None
 
+    mask = (pix[:, 0] > 150) & (pix[:, 1] < 150) & (pix[:, 2] > 120)
+    pink_count = int(np.count_nonzero(mask))
+
+    if pink_count > 0:
+        print(f'Frame {frame_num}: {pink_count:5} PINK pixels ({pink_count/len(pix)*100:5.2f}%)')
+        colors, counts = np.unique(pack_rgb(pix[mask]), return_counts=True)
+        for i in top_k(counts, 3):
+            r, g, b = unpack_rgb(colors[i])
+            print(f'  RGB({r},{g},{b}): {counts[i]} pixels')
+        return True
+    return False
+
 if __name__ == '__main__':
     if len(sys.argv) < 3:
         print("Usage: find_pink_frames.py <start_frame> <end_frame>")
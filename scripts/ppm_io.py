@@ -0,0 +1,109 @@
+"""Shared helpers for reading binary PPM (P6) frame dumps as NumPy arrays.
+
+Usage (from another script in this directory):
+  from ppm_io import load_rgb, pack_rgb
+  pix = load_rgb("dumps/ppu_frame_2195.ppm")   # (height, width, 3) uint8
+
+Notes:
+- By default the pixel payload is memory-mapped, not copied; the returned
+  array is a read-only view over the page cache.
+- Sweeps over many same-sized frames can pass a preallocated ``out`` buffer
+  instead, which is filled with a single readinto() per file.
+- parse_header() is the one P6 header parser for every script here; tokens may
+  be separated by any whitespace and "#" comments.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from typing import Optional
+
+import numpy as np
+
+
+# Separator between header tokens: whitespace and/or "#" comments. A comment
+# consumes its line terminator, so every header has exactly one parse and a
+# malformed one fails in linear time (no backtracking over runs of "#").
+_SEP = rb"(?:[ \t\r\n]|#[^\r\n]*[\r\n])"
+_HDR_RE = re.compile(
+    _SEP + rb"*([^\s#]+)" + _SEP + rb"+(\d+)" + _SEP + rb"+(\d+)" + _SEP + rb"+(\d+)[ \t\r\n]"
+)
+
+
+def parse_header(buf, path: str = "<buffer>") -> tuple[int, int, int]:
+    """Parse a P6 header at the start of buf (bytes, mmap, ...).
+
+    Returns (width, height, payload_offset). Tokens may be separated by any
+    whitespace and "#" comments, so single-line headers ("P6 2 1 255\n") and
+    commented multi-line ones both parse.
+    """
+    m = _HDR_RE.match(buf)
+    magic = m.group(1) if m else bytes(buf[:64]).lstrip(b" \t\r\n")[:2]
+    if magic != b"P6":
+        raise ValueError(f"Unsupported PPM magic {magic!r} (expected P6)")
+    if m is None:
+        raise ValueError(f"Malformed PPM header in {path}: expected 'P6 <width> <height> <maxval>'")
+    width, height, maxval = (int(v) for v in m.group(2, 3, 4))
+    if maxval != 255:
+        raise ValueError(f"Unsupported maxval {maxval} (expected 255)")
+    return width, height, m.end()
+
+
+def load_rgb(path: str, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Return a P6 PPM's pixels as a (height, width, 3) uint8 array.
+
+    Without ``out`` the file is memory-mapped and a zero-copy view is returned.
+    With ``out`` (a contiguous uint8 buffer of at least width*height*3 bytes)
+    the payload is read straight into it and a reshaped view of it is returned.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            parse_header(b"", path)  # raises
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        width, height, off = parse_header(mm, path)
+        expected = width * height * 3
+        if out is None:
+            if len(mm) - off < expected:
+                raise ValueError(f"Truncated pixel data: {len(mm) - off} < {expected}")
+            return np.frombuffer(mm, dtype=np.uint8, count=expected, offset=off).reshape(height, width, 3)
+
+        mm.close()
+        if out.size < expected:
+            raise ValueError(f"Buffer too small for {width}x{height} frame: {out.size} < {expected}")
+        view = out.reshape(-1)[:expected]
+        f.seek(off)
+        got = f.readinto(memoryview(view))
+        if got < expected:
+            raise ValueError(f"Truncated pixel data: {got} < {expected}")
+        return view.reshape(height, width, 3)
+
+
+def pack_rgb(pix: np.ndarray) -> np.ndarray:
+    """Pack the trailing RGB axis into one uint32 key per pixel (0xRRGGBB)."""
+    return (
+        (pix[..., 0].astype(np.uint32) << 16)
+        | (pix[..., 1].astype(np.uint32) << 8)
+        | pix[..., 2]
+    )
+
+
+def unpack_rgb(key: int) -> tuple[int, int, int]:
+    """Inverse of pack_rgb for a single key."""
+    key = int(key)
+    return key >> 16, (key >> 8) & 0xFF, key & 0xFF
+
+
+def top_k(counts: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest counts, largest first (ties keep index order)."""
+    k = min(k, counts.size)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    # argpartition picks arbitrary members of a tie at the k-th value; keep
+    # everything above it and fill the rest with the lowest tied indices.
+    kth = counts[np.argpartition(-counts, k - 1)[k - 1]]
+    above = np.flatnonzero(counts > kth)
+    tied = np.flatnonzero(counts == kth)[: k - above.size]
+    top = np.concatenate((above, tied))
+    return top[np.argsort(-counts[top], kind="stable")]
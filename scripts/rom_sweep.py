@@ -6,7 +6,7 @@ import argparse
 import os
 import shutil
 import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
@@ -27,20 +27,47 @@ def _build_bin(root: Path) -> Path:
   return root / "build" / "bin"
 
 
+def _default_jobs() -> int:
+  return max(1, (os.cpu_count() or 2) // 2)
+
+
+def _prepare_workdir(root: Path, rom: Path) -> Path:
+  # AIOServer writes crash_log.txt (and debug.log) into its cwd, so each ROM
+  # gets a private scratch dir; concurrent runs would otherwise clobber them.
+  workdir = root / "dumps" / "rom_sweep" / rom.stem
+  workdir.mkdir(parents=True, exist_ok=True)
+
+  # Keep the workspace .env visible (it is loaded relative to cwd).
+  env_file = root / ".env"
+  link = workdir / ".env"
+  if env_file.exists() and not os.path.lexists(link):
+    try:
+      os.symlink(env_file, link)
+    except OSError:
+      # No symlink support (e.g. Windows without privileges): a hardlink still
+      # avoids copying bytes; only copy across devices or when that fails too.
+      try:
+        os.link(env_file, link)
+      except OSError:
+        shutil.copy2(env_file, link)
+  return workdir
+
+
 def _run_aioserver(
   root: Path,
   aioserver: Path,
   rom: Path,
   timeout_s: float,
 ) -> RomResult:
-  crash_log = root / "crash_log.txt"
+  workdir = _prepare_workdir(root, rom)
+  crash_log = workdir / "crash_log.txt"
 
-  # Remove any previous crash log so we only see crashes from this run.
-  if crash_log.exists():
-    try:
-      crash_log.unlink()
-    except OSError:
-      pass
+  # Remove any stale crash log (e.g. from an interrupted sweep) so we only see
+  # crashes from this run.
+  try:
+    crash_log.unlink()
+  except OSError:
+    pass
 
   cmd = [
     str(aioserver),
@@ -52,25 +79,28 @@ def _run_aioserver(
     str(rom),
   ]
 
-  print(f"[RUN] {rom.name}")
-  print("cmd:", " ".join(cmd))
-  sys.stdout.flush()
+  # One write per run so concurrent workers don't interleave the two lines.
+  print(f"[RUN] {rom.name}\ncmd: {' '.join(cmd)}", flush=True)
 
   # Inherit environment; caller can set AIO_LOG_* or tracing flags if desired.
-  proc = subprocess.run(cmd, cwd=str(root))
+  proc = subprocess.run(cmd, cwd=str(workdir))
   exit_code = int(proc.returncode)
 
   crash_copy: Optional[Path] = None
-  if crash_log.exists() and crash_log.stat().st_size > 0:
-    # Store per-ROM crash log under dumps/rom_sweep/.
-    dumps_dir = root / "dumps" / "rom_sweep"
-    dumps_dir.mkdir(parents=True, exist_ok=True)
-    crash_copy = dumps_dir / f"{rom.stem}.crash_log.txt"
+  try:
+    crashed = crash_log.stat().st_size > 0
+  except FileNotFoundError:
+    crashed = False
+  if crashed:
+    # Store per-ROM crash log under dumps/rom_sweep/. The workdir lives there
+    # too, so this is a same-filesystem rename rather than a byte copy.
+    crash_copy = workdir.parent / f"{rom.stem}.crash_log.txt"
     try:
-      shutil.copy2(crash_log, crash_copy)
+      os.replace(crash_log, crash_copy)
       print(f"  -> crash_log captured at {crash_copy}")
     except OSError as e:
-      print(f"  !! failed to copy crash_log.txt for {rom.name}: {e}")
+      print(f"  !! failed to move crash_log.txt for {rom.name}: {e}")
+      crash_copy = None
 
   return RomResult(rom=rom, exit_code=exit_code, crash_log=crash_copy)
 
@@ -93,6 +123,13 @@ def main(argv: Optional[List[str]] = None) -> int:
     default=10.0,
     help="Headless run time per ROM in seconds (default: 10)",
   )
+  p.add_argument(
+    "--jobs",
+    "-j",
+    type=int,
+    default=_default_jobs(),
+    help="Number of ROMs to run concurrently (default: half the CPU count)",
+  )
   p.add_argument(
     "--aioserver",
     default="",
@@ -108,8 +145,10 @@ def main(argv: Optional[List[str]] = None) -> int:
   if not aioserver_path.exists():
     print(f"AIOServer not found at {aioserver_path}. Build the project first.")
     return 1
+  # Runs use per-ROM working directories, so every path handed over must be absolute.
+  aioserver_path = aioserver_path.resolve()
 
-  rom_dir = Path(args.roms_dir).expanduser()
+  rom_dir = Path(args.roms_dir).expanduser().resolve()
   if not rom_dir.exists() or not rom_dir.is_dir():
     print(f"ROM directory does not exist or is not a directory: {rom_dir}")
     return 1
@@ -119,12 +158,15 @@ def main(argv: Optional[List[str]] = None) -> int:
     print(f"No .gba ROMs found in {rom_dir}")
     return 0
 
-  print(f"Found {len(roms)} ROM(s) in {rom_dir}")
+  jobs = max(1, min(int(args.jobs), len(roms)))
+  print(f"Found {len(roms)} ROM(s) in {rom_dir} (jobs={jobs})")
+
+  def run(rom: Path) -> RomResult:
+    return _run_aioserver(root, aioserver_path, rom, timeout_s=float(args.timeout_s))
 
-  results: List[RomResult] = []
-  for rom in roms:
-    res = _run_aioserver(root, aioserver_path, rom, timeout_s=float(args.timeout_s))
-    results.append(res)
+  # Each run mostly waits on its AIOServer child, so threads are enough.
+  with ThreadPoolExecutor(max_workers=jobs) as ex:
+    results: List[RomResult] = list(ex.map(run, roms))
 
   failed = [r for r in results if r.exit_code != 0]
 
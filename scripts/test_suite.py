@@ -3,15 +3,22 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import importlib.util
+import json
 import os
 import re
+import signal
 import socket
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Tuple
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 
 @dataclass(frozen=True)
@@ -22,7 +29,13 @@ class TestCase:
     cmd: List[str]
     cwd: Path
     timeout_s: float
-    env: Dict[str, str]
+    env: Dict[str, str]  # full child environment (os.environ already merged in)
+    # AIOServer writes debug.log/crash_log.txt into its cwd, so those runs must
+    # not overlap each other even when --jobs > 1.
+    serial: bool = False
+    # Stream output while running with -j 1 (AIOServer runs, for crash
+    # diagnosis); otherwise output is captured and shown only on failure.
+    live: bool = False
 
 
 def _workspace_root() -> Path:
@@ -33,10 +46,77 @@ def _build_bin(root: Path) -> Path:
     return root / "build" / "bin"
 
 
+def _runtimes_path(root: Path) -> Path:
+    return root / "build" / ".test_runtimes.json"
+
+
+def _load_runtimes(root: Path) -> Dict[str, float]:
+    try:
+        with open(_runtimes_path(root), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: float(v) for k, v in data.items() if isinstance(v, (int, float))}
+
+
+def _save_runtimes(root: Path, runtimes: Dict[str, float]) -> None:
+    path = _runtimes_path(root)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(runtimes, f, indent=2, sort_keys=True)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"warning: could not save test runtimes to {path}: {e}")
+
+
+def _results_dir(root: Path) -> Path:
+    return root / "build" / ".test_results"
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: str) -> str:
+    # Memoized per run: AIOServer backs every app/fuzz test.
+    h = hashlib.blake2b()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _cache_key(tc: TestCase) -> Optional[str]:
+    # Content-addressed: the executable's bytes, any ROM it loads, its
+    # arguments and timeout, and the complete child environment (the caller's
+    # own variables such as GTEST_FILTER change what a run tests).
+    if "--nas-port" in tc.cmd:
+        # app.nas_smoke picks a fresh port each run; never serve it from cache.
+        return None
+    if tc.cmd[0] == sys.executable:
+        # Python tests: their inputs are the test and script sources, which
+        # are not part of the key.
+        return None
+    h = hashlib.blake2b()
+    try:
+        h.update(_file_digest(tc.cmd[0]).encode())
+        for i, arg in enumerate(tc.cmd[1:], start=1):
+            if tc.cmd[i - 1] == "--rom":
+                h.update(_file_digest(arg).encode())
+    except OSError:
+        return None
+    h.update(repr((tc.cmd[1:], tc.timeout_s, sorted(tc.env.items()))).encode())
+    return h.hexdigest()
+
+
+# Any run of characters other than [A-Za-z0-9-] (existing underscores
+# included) becomes a single "_", so no separate collapse pass is needed.
+_TOKEN_SEP = re.compile(r"[^A-Za-z0-9-]+")
+
+
 def _sanitize_test_token(s: str) -> str:
     # Keep identifiers stable and shell-friendly.
-    s = re.sub(r"[^A-Za-z0-9_-]+", "_", s)
-    s = re.sub(r"_+", "_", s).strip("_")
+    s = _TOKEN_SEP.sub("_", s).strip("_")
     return s or "unnamed"
 
 
@@ -61,40 +141,169 @@ def _pick_free_tcp_port() -> int:
         return int(s.getsockname()[1])
 
 
-def _run(cmd: Sequence[str], cwd: Path, env: Dict[str, str], timeout_s: float) -> int:
-    # Stream output live for better debugging.
-    p = subprocess.Popen(
+def _spawn_kwargs(cwd: Path) -> Dict[str, object]:
+    # POSIX launches start a new session (see _GROUP_KILL), which rules out
+    # subprocess's posix_spawn path, so there is nothing to gain from
+    # close_fds=False; keep the default so inherited fds (make jobserver, CI
+    # pipes) are not handed to every test.
+    return {"cwd": str(cwd)}
+
+
+# On POSIX every test leads its own session / process group, so a timeout or
+# --fail-fast can kill grandchildren too (wrapper scripts, helpers AIOServer
+# spawns). Left running, they keep stdout pipes open and keep writing
+# debug.log/crash_log.txt into the shared cwd while the next test runs.
+# A new session rules out subprocess's posix_spawn path for these launches.
+_GROUP_KILL = os.name == "posix"
+
+
+def _launch(cmd: Sequence[str], cwd: Path, env: Dict[str, str], stdout) -> subprocess.Popen:
+    return subprocess.Popen(
         list(cmd),
-        cwd=str(cwd),
-        env={**os.environ, **env},
-        stdout=subprocess.PIPE,
+        **_spawn_kwargs(cwd),
+        env=env,
+        stdout=stdout,
         stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
+        start_new_session=_GROUP_KILL,
     )
 
-    start = time.time()
+
+def _kill_tree(p: subprocess.Popen) -> None:
+    try:
+        if _GROUP_KILL:
+            os.killpg(p.pid, signal.SIGKILL)
+        else:
+            p.kill()
+    except Exception:
+        pass
+
+
+def _run(cmd: Sequence[str], cwd: Path, env: Dict[str, str], timeout_s: float) -> int:
+    # Stream output live for better debugging.
+    p = _launch(cmd, cwd, env, subprocess.PIPE)
+
+    # One-shot timer enforces the timeout. It also fires while the child is
+    # silent but still holding stdout open, and leaves a plain p.wait() below.
+    timed_out = threading.Event()
+
+    def kill() -> None:
+        timed_out.set()
+        _kill_tree(p)
+
+    timer = threading.Timer(timeout_s, kill)
+    timer.daemon = True
+    timer.start()
+
     assert p.stdout is not None
+    out = sys.stdout.buffer
+    try:
+        # Pass raw bytes through in large chunks; read1() returns whatever is
+        # available, so output still appears as the test produces it.
+        while True:
+            chunk = p.stdout.read1(65536)
+            if not chunk:
+                break
+            out.write(chunk)
+            out.flush()
+        rc = p.wait()
+    except BaseException:
+        # e.g. Ctrl-C: the detached group no longer gets the terminal's SIGINT.
+        _kill_tree(p)
+        raise
+    finally:
+        timer.cancel()
+    return 124 if timed_out.is_set() else rc
+
+
+def _test_logs_dir(root: Path) -> Path:
+    return root / "build" / "test_logs"
+
+
+def _run_quiet(tc: TestCase) -> Tuple[int, bytes]:
+    # Bounded-output tests (GoogleTest binaries): one communicate(), no loop.
+    p = _launch(tc.cmd, tc.cwd, tc.env, subprocess.PIPE)
     try:
-        for line in p.stdout:
-            sys.stdout.write(line)
-        return p.wait(timeout=max(0.0, timeout_s - (time.time() - start)))
+        out, _ = p.communicate(timeout=tc.timeout_s)
     except subprocess.TimeoutExpired:
+        _kill_tree(p)
+        out, _ = p.communicate()
+        return 124, out or b""
+    except BaseException:
+        _kill_tree(p)
+        raise
+    return p.returncode, out or b""
+
+
+# Children started by parallel workers, so --fail-fast can kill them.
+_ACTIVE: Set[subprocess.Popen] = set()
+_ACTIVE_LOCK = threading.Lock()
+_STOP = threading.Event()
+
+
+def _reset_active() -> None:
+    # main() may run more than once per process; start each parallel run clean.
+    with _ACTIVE_LOCK:
+        _STOP.clear()
+        _ACTIVE.clear()
+
+
+def _stop_active() -> None:
+    _STOP.set()
+    with _ACTIVE_LOCK:
+        for p in _ACTIVE:
+            _kill_tree(p)
+
+
+def _run_logged(tc: TestCase, log_dir: Path) -> Tuple[int, Path, float]:
+    # Parallel mode: the child writes straight into its own log file (no
+    # Python read loop). The .tmp name is swapped in once the test finishes,
+    # so <id>.log is always a complete log. Also returns the run's wall time.
+    log_path = log_dir / f"{tc.id}.log"
+    tmp_path = log_dir / f"{tc.id}.log.tmp"
+    start = time.monotonic()
+    with open(tmp_path, "wb") as log:
+        p = _launch(tc.cmd, tc.cwd, tc.env, log)
+        with _ACTIVE_LOCK:
+            _ACTIVE.add(p)
+            if _STOP.is_set():
+                # Launched just as --fail-fast fired.
+                _kill_tree(p)
         try:
-            p.kill()
-        except Exception:
-            pass
-        return 124
+            rc = p.wait(timeout=tc.timeout_s)
+        except subprocess.TimeoutExpired:
+            _kill_tree(p)
+            p.wait()
+            rc = 124
+        finally:
+            with _ACTIVE_LOCK:
+                _ACTIVE.discard(p)
+    elapsed = time.monotonic() - start
+    os.replace(tmp_path, log_path)
+    return rc, log_path, elapsed
+
+
+def _discover_roms(directory: Path) -> List[Path]:
+    # One scandir pass; the dirent type answers is_file() without a stat
+    # (symlinks still get followed), unlike Path.glob().
+    with os.scandir(directory) as it:
+        return sorted(Path(e.path) for e in it if e.name.endswith(".gba") and e.is_file())
 
 
 def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
     root = _workspace_root()
     bin_dir = _build_bin(root)
+    # --list only prints ids: skip the environment copy, port probe and path
+    # resolution that only matter for actually launching tests.
+    listing = bool(args.list)
 
     # Reduce noisy Qt output in headless test runs (while preserving any user rules).
     qt_rules = os.environ.get("QT_LOGGING_RULES", "").strip()
     qt_rules = (qt_rules + ";" if qt_rules else "") + "qt.qpa.fonts=false"
+    # Merge os.environ once; tests with the same overrides share one dict that
+    # is handed to Popen as-is.
+    base_env = {} if listing else dict(os.environ)
     qt_headless_env = {
+        **base_env,
         "QT_LOGGING_RULES": qt_rules,
         # Ensure QtWebEngine stays off in tests unless explicitly enabled by the user.
         "AIO_ENABLE_STREAMING": "0",
@@ -102,7 +311,15 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
 
     cases: List[TestCase] = []
 
-    def add(system: str, name: str, cmd: List[str], timeout_s: float, env: Optional[Dict[str, str]] = None) -> None:
+    def add(
+        system: str,
+        name: str,
+        cmd: List[str],
+        timeout_s: float,
+        env: Optional[Dict[str, str]] = None,
+        serial: bool = False,
+        live: bool = False,
+    ) -> None:
         test_id = f"{system}.{name}"
         cases.append(
             TestCase(
@@ -112,7 +329,9 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
                 cmd=cmd,
                 cwd=root,
                 timeout_s=timeout_s,
-                env=env or {},
+                env=env if env is not None else base_env,
+                serial=serial,
+                live=live,
             )
         )
 
@@ -129,16 +348,26 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
     if input_logic.exists():
         add("input", "logic", [str(input_logic)], timeout_s=float(args.unit_timeout_s))
 
+    # --- Python unit tests for the scripts/ tooling (need NumPy) ---
+    py_tests = root / "tests" / "python"
+    if py_tests.is_dir() and importlib.util.find_spec("numpy") is not None:
+        add(
+            "python",
+            "scripts",
+            [sys.executable, "-m", "unittest", "discover", "-s", str(py_tests)],
+            timeout_s=float(args.unit_timeout_s),
+        )
+
     # --- App-level smoke tests (AIOServer) ---
     aioserver = bin_dir / "AIOServer"
     if aioserver.exists():
         # NAS smoke: start server, verify index loads, then let it exit via --headless-max-ms.
         # (AIOServer always creates a MainWindow, so this is still a lightweight integration test.)
-        port = _pick_free_tcp_port()
-        nas_root = args.nas_root or str((root / "test_save_read").resolve())
+        port = 0 if listing else _pick_free_tcp_port()
+        nas_root = args.nas_root or ("" if listing else str((root / "test_save_read").resolve()))
         env = {
-            "AIO_NAS_ROOT": nas_root,
             **qt_headless_env,
+            "AIO_NAS_ROOT": nas_root,
         }
 
         add(
@@ -154,6 +383,8 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
             ],
             timeout_s=float(args.nas_smoke_seconds + 6.0),
             env=env,
+            serial=True,
+            live=True,
         )
 
         # Emulator fuzz runs (GBA): run for N seconds or fail fast on crash.
@@ -166,20 +397,19 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
         if args.roms_dir:
             rom_dir = Path(args.roms_dir).expanduser()
             if rom_dir.exists() and rom_dir.is_dir():
-                roms.extend(sorted(rom_dir.glob("*.gba")))
+                roms.extend(_discover_roms(rom_dir))
 
         if not roms and args.auto_discover_roms:
             # Best-effort: discover ROMs in workspace root.
-            roms.extend(sorted(root.glob("*.gba")))
+            roms.extend(_discover_roms(root))
 
-        # De-dup
+        # De-dup on the absolute path. That is enough for a key and needs no
+        # per-component lstat like resolve(); absolute also keeps --rom paths
+        # valid when the test runs with cwd=root.
         dedup: Dict[str, Path] = {}
         for r in roms:
-            try:
-                rp = r.resolve()
-            except Exception:
-                rp = r
-            dedup[str(rp)] = rp
+            ap = os.path.abspath(os.fspath(r))
+            dedup.setdefault(os.path.normcase(ap), Path(ap))
         roms = list(dedup.values())
 
         for rom in roms:
@@ -200,6 +430,8 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
                 ],
                 timeout_s=float(fuzz_seconds + 6.0),
                 env=qt_headless_env,
+                serial=True,
+                live=True,
             )
 
     return cases
@@ -207,51 +439,37 @@ def _build_test_manifest(args: argparse.Namespace) -> List[TestCase]:
 
 def _apply_filters(cases: List[TestCase], only: List[str], exclude: List[str]) -> List[TestCase]:
     by_id = {c.id: c for c in cases}
+    by_system: Dict[str, List[TestCase]] = {}
+    for c in cases:
+        by_system.setdefault(c.system, []).append(c)
 
-    def excluded(test_id: str) -> bool:
-        for token in exclude:
-            token = token.strip()
-            if not token:
-                continue
-            if "." in token:
-                # Exact test exclusion
-                if token == test_id:
-                    return True
-            else:
-                # Whole-system exclusion
-                if test_id.startswith(token + "."):
-                    return True
-        return False
+    # Split exclusions once: exact test ids vs whole systems.
+    ex_tokens = [t for t in (x.strip() for x in exclude) if t]
+    ex_ids = {t for t in ex_tokens if "." in t}
+    ex_systems = {t for t in ex_tokens if "." not in t}
 
     selected: List[TestCase]
     if only:
-        wanted: List[TestCase] = []
+        # De-dup while preserving order (dicts keep insertion order).
+        wanted: Dict[str, TestCase] = {}
         for oid in only:
             oid = oid.strip()
             if not oid:
                 continue
             if "." not in oid:
                 # Whole system whitelist
-                for c in cases:
-                    if c.id.startswith(oid + "."):
-                        wanted.append(c)
+                for c in by_system.get(oid, []):
+                    wanted.setdefault(c.id, c)
                 continue
             if oid in by_id:
-                wanted.append(by_id[oid])
+                wanted.setdefault(oid, by_id[oid])
             else:
                 raise SystemExit(f"Unknown test id in --only: {oid}")
-        # De-dup while preserving order
-        seen = set()
-        selected = []
-        for c in wanted:
-            if c.id in seen:
-                continue
-            seen.add(c.id)
-            selected.append(c)
+        selected = list(wanted.values())
     else:
         selected = list(cases)
 
-    selected = [c for c in selected if not excluded(c.id)]
+    selected = [c for c in selected if c.id not in ex_ids and c.system not in ex_systems]
     return selected
 
 
@@ -282,6 +500,31 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         ),
     )
 
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=(
+            "Run up to N tests in parallel (default: CPU count). "
+            "AIOServer runs still execute one at a time. In parallel mode each test's output goes to "
+            "build/test_logs/<id>.log and is printed only on failure; -j 1 streams AIOServer output live."
+        ),
+    )
+    p.add_argument(
+        "--cache",
+        action="store_true",
+        help=(
+            "Skip tests that already passed with identical inputs (executable and ROM contents, "
+            "arguments, timeout, full environment). app.nas_smoke always runs. "
+            "Results are kept in build/.test_results/."
+        ),
+    )
+    p.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at the first failing test: queued tests are skipped and running ones are killed",
+    )
     p.add_argument("--unit-timeout-s", type=float, default=90.0, help="Timeout per unit-test executable")
 
     # NAS smoke settings
@@ -321,24 +564,125 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print("No tests selected.")
         return 0
 
+    root = _workspace_root()
+
+    # --cache: skip tests that already passed with byte-identical inputs.
+    cache_keys: Dict[str, str] = {}
+    if args.cache:
+        results_dir = _results_dir(root)
+        remaining: List[TestCase] = []
+        for tc in selected:
+            key = _cache_key(tc)
+            if key is not None and (results_dir / key).is_file():
+                print(f"[CACHED] {tc.id}")
+                continue
+            if key is not None:
+                cache_keys[tc.id] = key
+            remaining.append(tc)
+        selected = remaining
+        if not selected:
+            print("All selected tests passed previously with identical inputs.")
+            return 0
+
     print(f"Running {len(selected)} test(s)...")
 
     failed: List[Tuple[TestCase, int]] = []
+    done = 0
 
-    for i, tc in enumerate(selected, start=1):
-        print("=" * 80)
-        print(f"[{i}/{len(selected)}] {tc.id}")
-        print(f"cmd: {' '.join(tc.cmd)}")
-        sys.stdout.flush()
+    # Measured runtimes (EMA over runs), used to schedule parallel runs.
+    runtimes = _load_runtimes(root)
 
-        rc = _run(tc.cmd, cwd=tc.cwd, env=tc.env, timeout_s=tc.timeout_s)
+    def record(tc: TestCase, elapsed: float) -> None:
+        prev = runtimes.get(tc.id)
+        runtimes[tc.id] = elapsed if prev is None else 0.5 * prev + 0.5 * elapsed
+
+    def report(tc: TestCase, rc: int) -> None:
+        nonlocal done
+        done += 1
         if rc != 0:
             failed.append((tc, rc))
             print(f"[FAIL] {tc.id} (exit={rc})")
         else:
             print(f"[ OK ] {tc.id}")
+            key = cache_keys.get(tc.id)
+            if key is not None:
+                try:
+                    results_dir.mkdir(parents=True, exist_ok=True)
+                    (results_dir / key).write_text("PASS\n", encoding="utf-8")
+                except OSError as e:
+                    print(f"warning: could not record cached result for {tc.id}: {e}")
+
+    def banner(i: int, tc: TestCase) -> None:
+        print("=" * 80)
+        print(f"[{i}/{len(selected)}] {tc.id}")
+        print(f"cmd: {' '.join(tc.cmd)}")
+
+    jobs = max(1, min(args.jobs, len(selected)))
+    if jobs == 1:
+        for i, tc in enumerate(selected, start=1):
+            banner(i, tc)
+            sys.stdout.flush()
+            start = time.monotonic()
+            if tc.live:
+                rc = _run(tc.cmd, cwd=tc.cwd, env=tc.env, timeout_s=tc.timeout_s)
+            else:
+                rc, out = _run_quiet(tc)
+                if rc != 0:
+                    sys.stdout.buffer.write(out)
+                    if out and not out.endswith(b"\n"):
+                        sys.stdout.buffer.write(b"\n")
+                    sys.stdout.buffer.flush()
+            record(tc, time.monotonic() - start)
+            report(tc, rc)
+            if failed and args.fail_fast:
+                break
+    else:
+        # Longest-first (LPT) keeps a long fuzz run from starting last and
+        # leaving the other workers idle. Unmeasured tests use their timeout.
+        selected.sort(key=lambda c: -runtimes.get(c.id, c.timeout_s))
+
+        # Tests are independent subprocesses; threads just wait on them.
+        # Serial tests get one dedicated worker (rather than pool workers
+        # blocking on each other) and the rest share the remaining slots.
+        # Results print in completion order; a failing test's log is echoed.
+        log_dir = _test_logs_dir(root)
+        log_dir.mkdir(parents=True, exist_ok=True)
+        _reset_active()
+
+        serial = [tc for tc in selected if tc.serial]
+        parallel = [tc for tc in selected if not tc.serial]
+        pool_jobs = max(1, jobs - 1) if serial else jobs
+        with ThreadPoolExecutor(max_workers=1) as serial_ex, ThreadPoolExecutor(max_workers=pool_jobs) as ex:
+            futs = {serial_ex.submit(_run_logged, tc, log_dir): tc for tc in serial}
+            futs.update({ex.submit(_run_logged, tc, log_dir): tc for tc in parallel})
+            for i, fut in enumerate(as_completed(futs), start=1):
+                tc = futs[fut]
+                rc, log_path, elapsed = fut.result()
+                record(tc, elapsed)
+                banner(i, tc)
+                if rc != 0:
+                    out = log_path.read_bytes()
+                    sys.stdout.flush()
+                    sys.stdout.buffer.write(out)
+                    if out and not out.endswith(b"\n"):
+                        sys.stdout.buffer.write(b"\n")
+                    sys.stdout.buffer.flush()
+                print(f"log: {log_path}")
+                report(tc, rc)
+                sys.stdout.flush()
+                if failed and args.fail_fast:
+                    # Drop queued tests and kill running ones; their results
+                    # are not reported.
+                    _stop_active()
+                    serial_ex.shutdown(wait=False, cancel_futures=True)
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    break
+
+    _save_runtimes(root, runtimes)
 
     print("=" * 80)
+    if done < len(selected):
+        print(f"--fail-fast: stopped after the first failure; {len(selected) - done} test(s) not run.")
     if failed:
         print(f"{len(failed)} test(s) failed:")
         for tc, rc in failed:
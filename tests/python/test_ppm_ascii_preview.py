@@ -0,0 +1,57 @@
+"""Regression tests for scripts/ppm_ascii_preview.py header parsing.
+
+Run with: python3 -m unittest discover -s tests/python
+(also registered as python.scripts in scripts/test_suite.py)
+"""
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from ppm_ascii_preview import load_ppm  # noqa: E402
+
+
+class LoadPpmHeaderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _write(self, data: bytes) -> str:
+        path = Path(self._tmp.name) / "frame.ppm"
+        path.write_bytes(data)
+        return str(path)
+
+    def test_comments_and_crlf_are_skipped(self):
+        path = self._write(b"P6\r\n# c\r\n2 1 # inline\n255\n" + bytes(range(6)))
+        w, h, pix = load_ppm(path)
+        self.assertEqual((w, h), (2, 1))
+        self.assertEqual(pix.tolist(), [[[0, 1, 2], [3, 4, 5]]])
+
+    def test_single_line_header(self):
+        w, h, pix = load_ppm(self._write(b"P6 2 1 255\n" + bytes(range(6))))
+        self.assertEqual((w, h), (2, 1))
+        self.assertEqual(pix.tolist(), [[[0, 1, 2], [3, 4, 5]]])
+
+    def test_malformed_header_after_long_comment(self):
+        # A backtracking separator needs ~2^n steps for a run of n "#", so with
+        # n=200 the old pattern never returns; a linear parse fails at once.
+        cases = [
+            b"P6\n# " + b"#" * 200 + b"\n240 160\n",  # truncated header
+            b"P6\n" + b"#" * 200 + b"\n240 x\n255\n",  # bad height token
+        ]
+        for data in cases:
+            with self.subTest(data=data[:12]):
+                with self.assertRaisesRegex(ValueError, "Malformed PPM header"):
+                    load_ppm(self._write(data))
+
+    def test_wrong_magic_is_reported(self):
+        path = self._write(b"P5\n2 2\n255\n" + b"\0" * 4)
+        with self.assertRaisesRegex(ValueError, r"Unsupported PPM magic b'P5'"):
+            load_ppm(path)
+
+
+if __name__ == "__main__":
+    unittest.main()